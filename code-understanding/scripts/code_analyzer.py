@@ -9,18 +9,177 @@ at each directory level with structured documentation content.
 import os
 import sys
 import argparse
+import shutil
+import threading
 from pathlib import Path
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from typing import Dict, List, Optional, Tuple
 import re
 import json
 from datetime import datetime
 
+# 预编译的正则表达式，避免每个文件重复解析模式。
+# 每种语言把函数/类/导入合并为一个带命名分组的正则，只需扫描一遍内容；
+# 分组名通过 *_KINDS 映射到分析结果中的字段。关键字与名称之间只允许空格/制表符，
+# 避免一个匹配跨行吞掉下一行的声明
+_PY_COMBINED_RE = re.compile(
+    r'def[ \t]+(?P<func>\w+)\s*\('
+    r'|class[ \t]+(?P<cls>\w+)'
+    r'|^(?:from|import)\s+(?P<imp>\S+)',
+    re.MULTILINE
+)
+_PY_KINDS = {'func': 'functions', 'cls': 'classes', 'imp': 'imports'}
+
+_JS_COMBINED_RE = re.compile(
+    r'function[ \t]+(?P<func>\w+)'
+    r'|const\s+(?P<arrow>\w+)\s*=\s*(?:async\s+)?\('
+    r'|class[ \t]+(?P<cls>\w+)'
+    r'|^import.*from\s+[\'"](?P<imp>\S+)[\'"]'
+    r'|^const\s+.*=\s*require\([\'"](?P<req>\S+)[\'"]\)',
+    re.MULTILINE
+)
+_JS_KINDS = {'func': 'functions', 'arrow': 'functions', 'cls': 'classes', 'imp': 'imports', 'req': 'imports'}
+
+_JAVA_COMBINED_RE = re.compile(
+    r'import\s+(?P<imp>[\w\.]+);'
+    r'|(?:public\s+)?class[ \t]+(?P<cls>\w+)'
+    r'|(?:public|private|protected)?\s*(?:static)?\s*\w+\s+(?P<func>\w+)\s*\('
+)
+_JAVA_KINDS = {'func': 'functions', 'cls': 'classes', 'imp': 'imports'}
+
+# 分析结果缓存文件（以"."开头，不会被当作源码分析）
+_CACHE_FILENAME = '.code_analyzer_cache.json'
+# 分析逻辑或结果结构变化时递增，使旧缓存失效
+_CACHE_VERSION = 6
+
+# 超过该大小的文件不读取内容（可通过 --max-read-bytes 调整）
+_DEFAULT_MAX_READ_BYTES = 1024 * 1024
+# 无法识别扩展名的文件超过该大小时同样跳过（多为锁文件、构建产物等）
+_UNKNOWN_MAX_READ_BYTES = 64 * 1024
+
+# 每个文件最多读取的字节数；描述只看前20行，声明也只保留前10个
+_DEFAULT_HEAD_BYTES = 64 * 1024
+# 判断二进制文件时检查的开头字节数，--head-bytes 不能小于该值
+_BINARY_SNIFF_BYTES = 1024
+
+# README中"生成时间"的格式
+_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# 提取文件描述时各语言识别的注释前缀；未列出的语言使用 _DEFAULT_COMMENT_PREFIXES
+_C_STYLE_COMMENT_PREFIXES = ('//', '/*')
+_COMMENT_PREFIXES = {
+    'python': ('#',), 'shell': ('#',), 'ruby': ('#',), 'yaml': ('#',), 'docker': ('#',),
+    'javascript': _C_STYLE_COMMENT_PREFIXES, 'typescript': _C_STYLE_COMMENT_PREFIXES,
+    'react': _C_STYLE_COMMENT_PREFIXES, 'java': _C_STYLE_COMMENT_PREFIXES,
+    'c': _C_STYLE_COMMENT_PREFIXES, 'cpp': _C_STYLE_COMMENT_PREFIXES,
+    'csharp': _C_STYLE_COMMENT_PREFIXES, 'go': _C_STYLE_COMMENT_PREFIXES,
+    'rust': _C_STYLE_COMMENT_PREFIXES, 'swift': _C_STYLE_COMMENT_PREFIXES,
+    'kotlin': _C_STYLE_COMMENT_PREFIXES, 'scala': _C_STYLE_COMMENT_PREFIXES,
+    'scss': _C_STYLE_COMMENT_PREFIXES, 'sass': _C_STYLE_COMMENT_PREFIXES,
+    'php': ('#', '//', '/*'), 'css': ('/*',),
+}
+_DEFAULT_COMMENT_PREFIXES = ('#', '//', '/*')
+# 只有这些语言需要检查docstring
+_DOCSTRING_LANGS = frozenset({'python'})
+
+# 每类（函数/类/导入）最多记录的条目数
+_MAX_MATCHES = 10
+
+# 超过该长度的行视为压缩代码，声明不在行首，逐行扫描无法识别
+_MINIFIED_LINE_LENGTH = 1000
+
+# 逐行扫描时先用一次 startswith 元组匹配过滤掉不可能是声明的行
+_PY_LINE_PREFIXES = ('def ', 'async def ', 'class ', 'import ', 'from ')
+_JS_LINE_PREFIXES = ('function ', 'class ', 'const ', 'import ')
+
+_JS_DECL_PREFIXES = ('export ', 'default ', 'async ')
+_JAVA_KEYWORDS = frozenset({
+    'new', 'return', 'throw', 'else', 'case', 'if', 'for', 'while',
+    'switch', 'catch', 'synchronized', 'try', 'do', 'assert',
+})
+
+
+def _leading_identifier(text: str) -> str:
+    """返回字符串开头的标识符"""
+    end = 0
+    while end < len(text) and (text[end].isalnum() or text[end] == '_'):
+        end += 1
+    return text[:end]
+
+
+def _strip_prefixes(text: str, prefixes: Tuple[str, ...]) -> str:
+    """反复去除字符串开头的修饰关键字"""
+    while text.startswith(prefixes):
+        for prefix in prefixes:
+            if text.startswith(prefix):
+                text = text[len(prefix):].lstrip()
+                break
+    return text
+
+
+def _collect_matches(pattern: re.Pattern, kinds: Dict[str, str], content: str,
+                     wanted: Optional[List[str]] = None) -> Dict[str, List[str]]:
+    """单次扫描组合正则，按命名分组归类；每类最多 _MAX_MATCHES 个。
+    wanted 指定只需收集的类别（默认全部），这些类别都达到上限即停止"""
+    results = {key: [] for key in kinds.values()}
+    targets = set(wanted) if wanted is not None else set(results)
+    remaining = len(targets)
+    for m in pattern.finditer(content):
+        key = kinds[m.lastgroup]
+        bucket = results[key]
+        if key in targets and len(bucket) < _MAX_MATCHES:
+            bucket.append(m.group(m.lastgroup))
+            if len(bucket) == _MAX_MATCHES:
+                remaining -= 1
+                if not remaining:
+                    break
+    return results
+
+
+def _fill_missing(result: Dict[str, List[str]], pattern: re.Pattern, kinds: Dict[str, str],
+                  content: str, lines: List[str]) -> Dict[str, List[str]]:
+    """逐行扫描无法处理的文件（完全没有结果、只有一行或含压缩长行）改用组合正则补充缺失的类别。
+    正常排版的文件不回退，避免正则在注释和文档字符串中误匹配"""
+    if any(result.values()) and len(lines) > 1 and max(map(len, lines)) <= _MINIFIED_LINE_LENGTH:
+        return result
+
+    missing = [key for key, values in result.items() if not values]
+    if missing:
+        fallback = _collect_matches(pattern, kinds, content, missing)
+        for key in missing:
+            result[key] = fallback[key]
+    return result
+
+
+def _quoted_prefix(text: str) -> str:
+    """提取字符串开头引号内的内容"""
+    if not text or text[0] not in '\'"':
+        return ''
+    end = text.find(text[0], 1)
+    return text[1:end] if end > 1 else ''
+
+
 class CodeAnalyzer:
     """代码分析器主类"""
 
-    def __init__(self, root_path: str, output_format: str = "markdown"):
+    def __init__(self, root_path: str, output_format: str = "markdown", use_cache: bool = True,
+                 max_read_bytes: int = _DEFAULT_MAX_READ_BYTES, head_bytes: int = _DEFAULT_HEAD_BYTES,
+                 keep_backup: bool = False):
         self.root_path = Path(root_path).resolve()
         self.output_format = output_format
+        self.use_cache = use_cache
+        self.max_read_bytes = max_read_bytes
+        self.head_bytes = head_bytes
+        self.keep_backup = keep_backup
+        self.cache_path = self.root_path / _CACHE_FILENAME
+        # 上次运行的缓存（只读）和本次运行的分析结果
+        self._cache = self.load_cache() if use_cache else {}
+        self._new_cache = {}
+        # 文件分析以磁盘I/O为主，线程数可以超过CPU核数
+        self.max_workers = min(32, (os.cpu_count() or 1) * 4)
+        # 文件分析线程池只在 generate_hierarchical_readmes 运行期间存在
+        self._file_pool: Optional[ThreadPoolExecutor] = None
         self.supported_extensions = {
             '.py': 'python',
             '.js': 'javascript', '.ts': 'typescript', '.jsx': 'react', '.tsx': 'react',
@@ -33,36 +192,126 @@ class CodeAnalyzer:
             '.md': 'markdown', '.txt': 'text', '.dockerfile': 'docker'
         }
 
-    def is_binary_file(self, file_path: Path) -> bool:
-        """检查是否为二进制文件"""
+    def load_cache(self) -> Dict:
+        """加载上次运行的分析缓存"""
         try:
-            with open(file_path, 'rb') as f:
-                chunk = f.read(1024)
-                return b'\0' in chunk
-        except:
-            return True
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        # 分析结果依赖读取的字节数，head_bytes 不同时缓存整体失效
+        if (not isinstance(cache, dict) or cache.get('version') != _CACHE_VERSION
+                or cache.get('head_bytes') != self.head_bytes):
+            return {}
+        files = cache.get('files')
+        if not isinstance(files, dict):
+            return {}
+        # 丢弃结构不完整的条目，查找时按未命中处理
+        return {key: entry for key, entry in files.items() if self._is_valid_cache_entry(entry)}
+
+    @staticmethod
+    def _is_valid_cache_entry(entry) -> bool:
+        """检查缓存条目结构是否完整"""
+        if not isinstance(entry, dict):
+            return False
+        analysis = entry.get('analysis')
+        return (isinstance(entry.get('mtime_ns'), int)
+                and isinstance(entry.get('size'), int)
+                and isinstance(analysis, dict)
+                and isinstance(analysis.get('name'), str)
+                and isinstance(analysis.get('type'), str)
+                and isinstance(analysis.get('language', ''), str))
+
+    def save_cache(self) -> None:
+        """原子地写入本次运行的分析缓存"""
+        tmp_path = self.cache_path.with_name(self.cache_path.name + '.tmp')
+        try:
+            # ensure_ascii 会转义非UTF-8文件名解码出的代理字符，读回时可还原
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': _CACHE_VERSION, 'head_bytes': self.head_bytes, 'files': self._new_cache}, f)
+            os.replace(tmp_path, self.cache_path)
+        except (OSError, ValueError) as e:
+            print(f"  ✗ 缓存写入失败: {e}")
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
 
     def get_file_language(self, file_path: Path) -> str:
         """根据文件扩展名获取编程语言"""
         suffix = file_path.suffix.lower()
         return self.supported_extensions.get(suffix, 'unknown')
 
-    def analyze_file(self, file_path: Path) -> Dict:
-        """分析单个文件"""
+    def analyze_file(self, file_path: Path, st: Optional[os.stat_result] = None) -> Dict:
+        """分析单个文件（st 为调用方已获取的stat结果，可避免重复stat）"""
         try:
-            if self.is_binary_file(file_path):
+            if st is None:
+                st = file_path.stat()
+
+            # 过大的文件（锁文件、压缩产物等）只记录基本信息，不读取内容
+            language = self.get_file_language(file_path)
+            if st.st_size > self.max_read_bytes or (language == 'unknown' and st.st_size > _UNKNOWN_MAX_READ_BYTES):
+                return {
+                    'name': file_path.name,
+                    'type': 'skipped',
+                    'size': st.st_size,
+                    'language': language
+                }
+
+            key = str(file_path)
+
+            # 文件未变化（修改时间和大小一致）时直接复用上次的分析结果
+            entry = self._cache.get(key)
+            if entry and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+                analysis = entry['analysis']
+                # JSON 解码出的字符串不会驻留，语言名在各目录间大量重复，统一驻留
+                if 'language' in analysis:
+                    analysis['language'] = sys.intern(analysis['language'])
+            else:
+                # 只打开一次文件并只读取开头部分，二进制判断和分析共用同一缓冲区
+                with open(file_path, 'rb') as f:
+                    data = f.read(self.head_bytes)
+                analysis = self.analyze_file_bytes(file_path, data, st.st_size)
+        except OSError as e:
+            return {
+                'name': file_path.name,
+                'type': 'error',
+                'error': str(e)
+            }
+
+        if self.use_cache and analysis['type'] != 'error':
+            self._new_cache[key] = {
+                'mtime_ns': st.st_mtime_ns,
+                'size': st.st_size,
+                'analysis': analysis
+            }
+
+        return analysis
+
+    def analyze_file_bytes(self, file_path: Path, data: bytes, size: Optional[int] = None) -> Dict:
+        """分析已读入内存的文件内容（size 为文件实际大小，大于 data 长度表示只读取了开头部分）"""
+        try:
+            if size is None:
+                size = len(data)
+            truncated = len(data) < size
+
+            if b'\0' in data[:_BINARY_SNIFF_BYTES]:
                 return {
                     'name': file_path.name,
                     'type': 'binary',
-                    'size': file_path.stat().st_size,
+                    'size': size,
                     'language': 'binary'
                 }
 
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            if truncated:
+                # 丢弃被截断的最后一行，避免提取出不完整的标识符
+                data = data[:data.rfind(b'\n') + 1] or data
+            content = data.decode('utf-8', errors='ignore')
 
             language = self.get_file_language(file_path)
-            lines = len(content.splitlines())
+            all_lines = content.splitlines()
+            lines = len(all_lines)
 
             # 基本代码分析
             analysis = {
@@ -70,20 +319,21 @@ class CodeAnalyzer:
                 'type': 'source',
                 'language': language,
                 'lines': lines,
-                'size': file_path.stat().st_size,
+                'lines_truncated': truncated,
+                'size': size,
                 'functions': [],
                 'classes': [],
                 'imports': [],
-                'description': self.extract_description(content, language)
+                'description': self.extract_description(all_lines[:20], language)  # 只检查前20行
             }
 
             # 根据语言进行特定分析
             if language == 'python':
-                analysis.update(self.analyze_python_file(content))
+                analysis.update(self.analyze_python_file(content, all_lines))
             elif language in ['javascript', 'typescript']:
-                analysis.update(self.analyze_js_file(content))
+                analysis.update(self.analyze_js_file(content, all_lines))
             elif language == 'java':
-                analysis.update(self.analyze_java_file(content))
+                analysis.update(self.analyze_java_file(content, all_lines))
 
             return analysis
 
@@ -94,83 +344,177 @@ class CodeAnalyzer:
                 'error': str(e)
             }
 
-    def extract_description(self, content: str, language: str) -> str:
-        """提取文件描述"""
-        lines = content.splitlines()[:20]  # 只检查前20行
+    def extract_description(self, head_lines: List[str], language: str) -> str:
+        """从文件开头的若干行中提取文件描述"""
+        # 按语言预先确定需要检查的注释前缀和是否检查docstring
+        prefixes = _COMMENT_PREFIXES.get(language, _DEFAULT_COMMENT_PREFIXES)
+        check_docstring = language in _DOCSTRING_LANGS
 
-        for line in lines:
+        for line in head_lines:
             line = line.strip()
             # 寻找注释行
-            if line.startswith('#') or line.startswith('//') or line.startswith('/*'):
-                desc = re.sub(r'^[#/*\s]+', '', line).strip()
+            if line.startswith(prefixes):
+                desc = line.lstrip('#/* \t').strip()
                 if len(desc) > 10 and len(desc) < 200:
                     return desc
             # 寻找docstring
-            if '"""' in line or "'''" in line:
-                desc = re.sub(r'["\'\s]+', '', line).strip()
+            if check_docstring and ('"""' in line or "'''" in line):
+                desc = line.strip('\'" \t')
                 if len(desc) > 10 and len(desc) < 200:
                     return desc
 
         return f"{language}源代码文件"
 
-    def analyze_python_file(self, content: str) -> Dict:
-        """分析Python文件"""
-        functions = re.findall(r'def\s+(\w+)\s*\(', content)
-        classes = re.findall(r'class\s+(\w+)', content)
-        imports = re.findall(r'^(?:from|import)\s+(\S+)', content, re.MULTILINE)
+    def analyze_python_file(self, content: str, lines: Optional[List[str]] = None) -> Dict:
+        """分析Python文件（lines 为调用方已拆分好的行，可避免重复拆分）"""
+        if lines is None:
+            lines = content.splitlines()
+        return _fill_missing(self._analyze_python_fast(lines), _PY_COMBINED_RE, _PY_KINDS, content, lines)
 
-        return {
-            'functions': functions[:10],  # 限制显示数量
-            'classes': classes[:10],
-            'imports': imports[:10]
-        }
+    def _analyze_python_fast(self, lines: List[str]) -> Dict:
+        """单次逐行扫描Python文件"""
+        functions, classes, imports = [], [], []
 
-    def analyze_js_file(self, content: str) -> Dict:
-        """分析JavaScript/TypeScript文件"""
-        functions = re.findall(r'(?:function\s+(\w+)|const\s+(\w+)\s*=\s*(?:async\s+)?\()', content)
-        functions = [f[0] or f[1] for f in functions if f[0] or f[1]]
-        classes = re.findall(r'class\s+(\w+)', content)
-        imports = re.findall(r'^(?:import.*from\s+[\'"](\S+)[\'"]|const\s+.*=\s*require\([\'"](\S+)[\'"]\))', content, re.MULTILINE)
-        imports = [imp[0] or imp[1] for imp in imports if imp[0] or imp[1]]
+        for line in lines:
+            s = line.lstrip()
+            if not s.startswith(_PY_LINE_PREFIXES):
+                continue
+            if s.startswith('async def '):
+                s = s[6:]
+            if s.startswith('def '):
+                rest = s[4:].lstrip()
+                name = _leading_identifier(rest)
+                if name and len(functions) < _MAX_MATCHES and rest[len(name):].lstrip().startswith('('):
+                    functions.append(name)
+            elif s.startswith('class '):
+                name = _leading_identifier(s[6:].lstrip())
+                if name and len(classes) < _MAX_MATCHES:
+                    classes.append(name)
+            elif line.startswith(('import ', 'from ')) and len(imports) < _MAX_MATCHES:
+                parts = line.split(None, 2)
+                if len(parts) > 1:
+                    imports.append(parts[1])
+            else:
+                continue
 
-        return {
-            'functions': functions[:10],
-            'classes': classes[:10],
-            'imports': imports[:10]
-        }
+            if len(functions) >= _MAX_MATCHES and len(classes) >= _MAX_MATCHES and len(imports) >= _MAX_MATCHES:
+                break
 
-    def analyze_java_file(self, content: str) -> Dict:
-        """分析Java文件"""
-        classes = re.findall(r'(?:public\s+)?class\s+(\w+)', content)
-        methods = re.findall(r'(?:public|private|protected)?\s*(?:static)?\s*\w+\s+(\w+)\s*\(', content)
-        imports = re.findall(r'import\s+([\w\.]+);', content)
+        return {'functions': functions, 'classes': classes, 'imports': imports}
 
-        return {
-            'classes': classes[:10],
-            'functions': methods[:10],
-            'imports': imports[:10]
-        }
+    def analyze_js_file(self, content: str, lines: Optional[List[str]] = None) -> Dict:
+        """分析JavaScript/TypeScript文件（lines 为调用方已拆分好的行，可避免重复拆分）"""
+        if lines is None:
+            lines = content.splitlines()
+        return _fill_missing(self._analyze_js_fast(lines), _JS_COMBINED_RE, _JS_KINDS, content, lines)
+
+    def _analyze_js_fast(self, lines: List[str]) -> Dict:
+        """单次逐行扫描JavaScript/TypeScript文件"""
+        functions, classes, imports = [], [], []
+
+        for line in lines:
+            s = _strip_prefixes(line.lstrip(), _JS_DECL_PREFIXES)
+            if not s.startswith(_JS_LINE_PREFIXES):
+                continue
+            if s.startswith('function '):
+                name = _leading_identifier(s[9:].lstrip())
+                if name and len(functions) < _MAX_MATCHES:
+                    functions.append(name)
+            elif s.startswith('class '):
+                name = _leading_identifier(s[6:].lstrip())
+                if name and len(classes) < _MAX_MATCHES:
+                    classes.append(name)
+            elif s.startswith('const '):
+                rest = s[6:].lstrip()
+                name = _leading_identifier(rest)
+                rest = rest[len(name):].lstrip()
+                if name and rest.startswith('=') and len(functions) < _MAX_MATCHES:
+                    rest = rest[1:].lstrip()
+                    if rest.startswith('async '):
+                        rest = rest[6:].lstrip()
+                    if rest.startswith('('):
+                        functions.append(name)
+
+            if len(imports) < _MAX_MATCHES:
+                if line.startswith('import ') and ' from ' in line:
+                    module = _quoted_prefix(line.rsplit(' from ', 1)[1].lstrip())
+                    if module:
+                        imports.append(module)
+                elif line.startswith('const ') and 'require(' in line:
+                    module = _quoted_prefix(line.split('require(', 1)[1])
+                    if module:
+                        imports.append(module)
+
+            if len(functions) >= _MAX_MATCHES and len(classes) >= _MAX_MATCHES and len(imports) >= _MAX_MATCHES:
+                break
+
+        return {'functions': functions, 'classes': classes, 'imports': imports}
+
+    def analyze_java_file(self, content: str, lines: Optional[List[str]] = None) -> Dict:
+        """分析Java文件（lines 为调用方已拆分好的行，可避免重复拆分）"""
+        if lines is None:
+            lines = content.splitlines()
+        return _fill_missing(self._analyze_java_fast(lines), _JAVA_COMBINED_RE, _JAVA_KINDS, content, lines)
+
+    def _analyze_java_fast(self, lines: List[str]) -> Dict:
+        """单次逐行扫描Java文件"""
+        classes, methods, imports = [], [], []
+
+        for line in lines:
+            s = line.strip()
+            if not s or s.startswith(('//', '/*', '*')):
+                continue
+
+            if s.startswith('import '):
+                name = s[7:].split(';', 1)[0].strip()
+                if len(imports) < _MAX_MATCHES and all(part.isidentifier() for part in name.split('.')):
+                    imports.append(name)
+                continue
+            if '(' not in s and 'class' not in s:
+                continue
+
+            tokens = s.split('(', 1)[0].split()
+            if 'class' in tokens[:-1]:
+                name = _leading_identifier(tokens[tokens.index('class') + 1])
+                if name and len(classes) < _MAX_MATCHES:
+                    classes.append(name)
+            elif '(' in s and len(tokens) >= 2 and len(methods) < _MAX_MATCHES:
+                name, type_name = tokens[-1], tokens[-2]
+                if (name.isidentifier() and name not in _JAVA_KEYWORDS
+                        and type_name not in _JAVA_KEYWORDS
+                        and (type_name[-1].isalnum() or type_name[-1] in '_>]')):
+                    methods.append(name)
+
+            if len(classes) >= _MAX_MATCHES and len(methods) >= _MAX_MATCHES and len(imports) >= _MAX_MATCHES:
+                break
+
+        return {'classes': classes, 'functions': methods, 'imports': imports}
 
     def analyze_directory(self, dir_path: Path) -> Dict:
         """分析目录"""
-        if not dir_path.exists():
-            return {'error': f'Directory {dir_path} does not exist'}
-
         directories = []
-        files = []
+        file_entries = []
 
         try:
-            for item in dir_path.iterdir():
-                if item.name.startswith('.'):
-                    continue
-
-                if item.is_dir():
-                    directories.append(item)
-                else:
-                    files.append(self.analyze_file(item))
+            # scandir 返回的条目自带文件类型信息，判断目录无需额外stat
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    if entry.name.startswith('.'):
+                        continue
+
+                    if entry.is_dir():
+                        directories.append(Path(entry.path))
+                    else:
+                        file_entries.append(entry)
+        except FileNotFoundError:
+            return {'error': f'Directory {dir_path} does not exist'}
         except PermissionError:
             return {'error': f'Permission denied accessing {dir_path}'}
 
+        # 各文件的分析互不依赖，有线程池时并发执行以重叠磁盘读取；单独调用时顺序分析
+        mapper = self._file_pool.map if self._file_pool is not None else map
+        files = list(mapper(self._analyze_entry, file_entries))
+
         return {
             'name': dir_path.name,
             'path': str(dir_path.relative_to(self.root_path)),
@@ -183,96 +527,112 @@ class CodeAnalyzer:
             }
         }
 
+    def _analyze_entry(self, entry: os.DirEntry) -> Dict:
+        """分析scandir返回的文件条目，复用条目缓存的stat结果"""
+        try:
+            st = entry.stat()
+        except OSError:
+            st = None
+        return self.analyze_file(Path(entry.path), st)
+
     def count_languages(self, files: List[Dict]) -> Dict[str, int]:
         """统计编程语言"""
-        lang_count = {}
-        for file_info in files:
-            lang = file_info.get('language', 'unknown')
-            lang_count[lang] = lang_count.get(lang, 0) + 1
-        return dict(sorted(lang_count.items(), key=lambda x: x[1], reverse=True))
+        return dict(Counter(f.get('language', 'unknown') for f in files).most_common())
 
-    def generate_readme_content(self, dir_analysis: Dict, depth: int = 0) -> str:
+    def generate_readme_content(self, dir_analysis: Dict, depth: int = 0,
+                                generated_at: Optional[str] = None) -> str:
         """生成README内容"""
+        return "".join(self.generate_readme_parts(dir_analysis, depth, generated_at))
+
+    def generate_readme_parts(self, dir_analysis: Dict, depth: int = 0,
+                              generated_at: Optional[str] = None) -> List[str]:
+        """按片段生成README内容，写入时可逐段写出而无需拼接成整个字符串"""
         if 'error' in dir_analysis:
-            return f"# 错误\n\n无法分析此目录: {dir_analysis['error']}"
+            return [f"# 错误\n\n无法分析此目录: {dir_analysis['error']}"]
 
         name = dir_analysis['name']
         path = dir_analysis['path']
         stats = dir_analysis['stats']
+        if generated_at is None:
+            generated_at = datetime.now().strftime(_TIMESTAMP_FORMAT)
 
-        content = f"""# {name}
+        parts = [f"""# {name}
 
 ## 模块概述
 
 此模块包含 {stats['total_files']} 个文件和 {stats['total_dirs']} 个子目录。
 
 **目录路径:** `{path}`
-**生成时间:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+**生成时间:** {generated_at}
 
 **主要编程语言:**
-"""
+"""]
 
         # 添加语言统计
         for lang, count in list(stats['languages'].items())[:5]:
-            content += f"- {lang}: {count} 个文件\n"
+            parts.append(f"- {lang}: {count} 个文件\n")
 
-        content += f"\n## 模块讲解\n\n"
+        parts.append("\n## 模块讲解\n\n")
 
         # 添加子目录信息
         if dir_analysis['directories']:
-            content += "### 子目录\n\n"
+            parts.append("### 子目录\n\n")
             for subdir in dir_analysis['directories']:
-                content += f"- **{subdir.name}/** - 包含相关模块和文件\n"
-            content += "\n"
+                parts.append(f"- **{subdir.name}/** - 包含相关模块和文件\n")
+            parts.append("\n")
 
         # 添加文件摘要
         if dir_analysis['files']:
-            content += "### 文件摘要\n\n"
+            parts.append("### 文件摘要\n\n")
 
             # 按类型分组文件
             source_files = [f for f in dir_analysis['files'] if f['type'] == 'source']
             other_files = [f for f in dir_analysis['files'] if f['type'] != 'source']
 
             if source_files:
-                content += "#### 源代码文件\n\n"
+                parts.append("#### 源代码文件\n\n")
                 for file_info in source_files:
-                    content += self.format_file_summary(file_info, depth)
+                    parts.append(self.format_file_summary(file_info, depth))
 
             if other_files:
-                content += "#### 其他文件\n\n"
+                parts.append("#### 其他文件\n\n")
                 for file_info in other_files:
-                    content += f"- **{file_info['name']}** ({file_info['type']})\n"
+                    parts.append(f"- **{file_info['name']}** ({file_info['type']})\n")
 
-        content += f"\n---\n*此文档由代码理解工具自动生成*"
+        parts.append("\n---\n*此文档由代码理解工具自动生成*")
 
-        return content
+        return parts
 
     def format_file_summary(self, file_info: Dict, depth: int) -> str:
         """格式化文件摘要"""
         name = file_info['name']
         language = file_info['language']
         lines = file_info.get('lines', 'N/A')
+        if file_info.get('lines_truncated'):
+            lines = f"{lines}+"  # 只读取了文件开头，实际行数更多
         description = file_info.get('description', f'{language}源代码文件')
 
-        summary = f"##### {name}\n\n"
-        summary += f"**语言:** {language}  \n"
-        summary += f"**行数:** {lines}  \n"
-        summary += f"**描述:** {description}\n\n"
+        parts = [
+            f"##### {name}\n\n",
+            f"**语言:** {language}  \n",
+            f"**行数:** {lines}  \n",
+            f"**描述:** {description}\n\n",
+        ]
 
         # 添加函数/类信息
         if file_info.get('functions'):
             funcs = file_info['functions'][:5]  # 只显示前5个
-            summary += f"**主要函数:** `{'`, `'.join(funcs)}`\n\n"
+            parts.append(f"**主要函数:** `{'`, `'.join(funcs)}`\n\n")
 
         if file_info.get('classes'):
             classes = file_info['classes'][:5]  # 只显示前5个
-            summary += f"**主要类:** `{'`, `'.join(classes)}`\n\n"
+            parts.append(f"**主要类:** `{'`, `'.join(classes)}`\n\n")
 
         if file_info.get('imports'):
             imports = file_info['imports'][:3]  # 只显示前3个
-            summary += f"**依赖项:** `{'`, `'.join(imports)}`\n\n"
+            parts.append(f"**依赖项:** `{'`, `'.join(imports)}`\n\n")
 
-        return summary
+        return "".join(parts)
 
     def generate_hierarchical_readmes(self, dry_run: bool = False) -> None:
         """递归生成层级化README文件"""
@@ -281,44 +641,97 @@ class CodeAnalyzer:
             return
 
         print(f"开始分析代码库: {self.root_path}")
+        # 所有README共用同一个生成时间
+        generated_at = datetime.now().strftime(_TIMESTAMP_FORMAT)
+        print_lock = threading.Lock()
+        pending_writes: List[Tuple[Path, List[str]]] = []
 
         def process_directory(dir_path: Path, relative_path: str = ""):
             """处理单个目录"""
-            print(f"正在处理: {relative_path or '根目录'}")
+            # 多个目录并发处理，先收集本目录的输出，最后整体打印，避免不同目录的输出交错
+            log = [f"正在处理: {relative_path or '根目录'}"]
 
             # 分析当前目录
             analysis = self.analyze_directory(dir_path)
 
             # 生成README内容
-            readme_content = self.generate_readme_content(analysis, relative_path.count('/'))
+            readme_parts = self.generate_readme_parts(analysis, relative_path.count('/'), generated_at)
 
             # 确定README文件路径
             readme_path = dir_path / 'README.md'
 
             if not dry_run:
-                # 检查是否已存在README
-                if readme_path.exists():
-                    backup_path = readme_path.with_suffix('.md.backup')
-                    print(f"  备份现有README: {backup_path}")
-                    readme_path.rename(backup_path)
+                # 分析阶段只读，README统一在遍历结束后写入
+                pending_writes.append((readme_path, readme_parts))
+            else:
+                log.append(f"  [预览] 将生成README: {readme_path}")
+                log.append(f"  [预览] 内容长度: {sum(map(len, readme_parts))} 字符")
+
+            with print_lock:
+                print("\n".join(log))
+
+            # 返回子目录，由调用方提交到线程池继续处理
+            return [
+                (subdir, f"{relative_path}/{subdir.name}" if relative_path else subdir.name)
+                for subdir in analysis.get('directories', [])
+            ]
+
+        # 各子目录相互独立，提交到线程池并发处理
+        with ThreadPoolExecutor(max_workers=self.max_workers) as file_pool, \
+                ThreadPoolExecutor(max_workers=self.max_workers) as dir_pool:
+            self._file_pool = file_pool
+            try:
+                pending = {dir_pool.submit(process_directory, self.root_path)}
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        for subdir, relative_path in future.result():
+                            pending.add(dir_pool.submit(process_directory, subdir, relative_path))
+            finally:
+                self._file_pool = None
+
+        # 集中写入所有README
+        if pending_writes:
+            pending_writes.sort(key=lambda item: item[0])
+            with ThreadPoolExecutor(max_workers=self.max_workers) as write_pool:
+                for log in write_pool.map(lambda item: self._write_readme(*item), pending_writes):
+                    print("\n".join(log))
+
+        if self.use_cache and not dry_run:
+            self.save_cache()
+
+        print("\n代码分析完成!")
 
-                # 写入新的README
+    def _write_readme(self, readme_path: Path, parts: List[str]) -> List[str]:
+        """写入单个README，返回输出信息"""
+        log = []
+        tmp_path = readme_path.with_suffix('.md.tmp')
+
+        try:
+            # 先逐段写入同目录下的临时文件，再原子替换，避免留下写了一半的README
+            with open(tmp_path, 'w', encoding='utf-8', buffering=1 << 16) as f:
+                for chunk in parts:
+                    f.write(chunk)
+
+            if self.keep_backup:
+                backup_path = readme_path.with_suffix('.md.backup')
+                # 复制而不是移动，原README在替换前始终存在
                 try:
-                    with open(readme_path, 'w', encoding='utf-8') as f:
-                        f.write(readme_content)
-                    print(f"  ✓ 生成README: {readme_path}")
-                except Exception as e:
-                    print(f"  ✗ 写入失败: {e}")
-            else:
-                print(f"  [预览] 将生成README: {readme_path}")
-                print(f"  [预览] 内容长度: {len(readme_content)} 字符")
+                    shutil.copy2(readme_path, backup_path)
+                    log.append(f"  备份现有README: {backup_path}")
+                except FileNotFoundError:
+                    pass
 
-            # 递归处理子目录
-            for subdir in analysis.get('directories', []):
-                process_directory(subdir, f"{relative_path}/{subdir.name}" if relative_path else subdir.name)
+            os.replace(tmp_path, readme_path)
+            log.append(f"  ✓ 生成README: {readme_path}")
+        except Exception as e:
+            log.append(f"  ✗ 写入失败: {e}")
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
 
-        process_directory(self.root_path)
-        print("\n代码分析完成!")
+        return log
 
 def main():
     """主函数"""
@@ -326,10 +739,22 @@ def main():
     parser.add_argument('path', nargs='?', default='.', help='要分析的代码路径 (默认: 当前目录)')
     parser.add_argument('--dry-run', action='store_true', help='预览模式，不实际写入文件')
     parser.add_argument('--format', choices=['markdown', 'json'], default='markdown', help='输出格式')
+    parser.add_argument('--keep-backup', action='store_true', help='覆盖前将现有README备份为README.md.backup')
+    parser.add_argument('--no-cache', action='store_true', help='忽略并且不写入分析缓存，重新分析所有文件')
+    parser.add_argument('--max-read-bytes', type=int, default=_DEFAULT_MAX_READ_BYTES,
+                        help=f'超过该大小(字节)的文件不读取内容 (默认: {_DEFAULT_MAX_READ_BYTES})')
+    parser.add_argument('--head-bytes', type=int, default=_DEFAULT_HEAD_BYTES,
+                        help=f'每个文件最多读取的字节数 (默认: {_DEFAULT_HEAD_BYTES})')
 
     args = parser.parse_args()
-
-    analyzer = CodeAnalyzer(args.path, args.format)
+    if args.max_read_bytes <= 0:
+        parser.error('--max-read-bytes 必须为正整数')
+    if args.head_bytes < _BINARY_SNIFF_BYTES:
+        parser.error(f'--head-bytes 不能小于 {_BINARY_SNIFF_BYTES}（二进制检测需要读取的字节数）')
+
+    analyzer = CodeAnalyzer(args.path, args.format, use_cache=not args.no_cache,
+                            max_read_bytes=args.max_read_bytes, head_bytes=args.head_bytes,
+                            keep_backup=args.keep_backup)
     analyzer.generate_hierarchical_readmes(dry_run=args.dry_run)
 
 if __name__ == "__main__":